@@ -0,0 +1,831 @@
+/*
+ * Native SHA3-256d search kernel for the XELIS contract miner.
+ *
+ * Build in-place next to the miner script with:
+ *   python setup.py build_ext --inplace
+ *
+ * PoW hash (see verify_sha256d in mineable_token_contract.slx):
+ *   SHA3-256(SHA3-256(header_hash || nonce_le64)) <= MAX_TARGET / difficulty
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <stdint.h>
+#include <string.h>
+
+#if defined(__x86_64__) && (defined(__GNUC__) || defined(__clang__))
+#include <immintrin.h>
+#define HAVE_X86_SIMD 1
+#define TARGET_AVX2 __attribute__((target("avx2")))
+#define TARGET_AVX512 __attribute__((target("avx512f,avx512bw")))
+#define ALIGN64 __attribute__((aligned(64)))
+#endif
+
+#ifdef HAVE_XKCP
+// XKCP's KeccakP-1600-times4 SnP interface, see XKCP_DIR in setup.py
+#include "KeccakP-1600-times4-SnP.h"
+#define XKCP_ENABLED 1
+#else
+#define XKCP_ENABLED 0
+#endif
+
+#define SHA3_256_RATE 136
+#define HEADER_HASH_SIZE 32
+#define DIGEST_SIZE 32
+#define INPUT_SIZE (HEADER_HASH_SIZE + 8)
+
+// SHA3 padding lanes: 0x06 after the message, 0x80 in the last rate byte
+#define PAD_FIRST 0x06ULL
+#define PAD_LAST 0x8000000000000000ULL
+
+// Nonces hashed between polls of mine_batch's cancel word; a multiple of every SIMD width
+#define CANCEL_CHECK_INTERVAL 65536
+
+// ====================
+// KECCAK-F[1600]
+// ====================
+static const uint64_t keccakf_rndc[24] = {
+    0x0000000000000001ULL, 0x0000000000008082ULL, 0x800000000000808aULL,
+    0x8000000080008000ULL, 0x000000000000808bULL, 0x0000000080000001ULL,
+    0x8000000080008081ULL, 0x8000000000008009ULL, 0x000000000000008aULL,
+    0x0000000000000088ULL, 0x0000000080008009ULL, 0x000000008000000aULL,
+    0x000000008000808bULL, 0x800000000000008bULL, 0x8000000000008089ULL,
+    0x8000000000008003ULL, 0x8000000000008002ULL, 0x8000000000000080ULL,
+    0x000000000000800aULL, 0x800000008000000aULL, 0x8000000080008081ULL,
+    0x8000000000008080ULL, 0x0000000080000001ULL, 0x8000000080008008ULL
+};
+
+/*
+ * Keccak-f[1600] with each round fully unrolled, shared by the scalar and
+ * SIMD permutations. In the SIMD versions A[i] holds lane i of every
+ * interleaved sponge (SoA). XOR, ANDN(a, b) = ~a & b, ROL and RC(round) are
+ * defined for the lane type before expanding.
+ */
+#define KECCAKF1600_BODY(T, A)                                            \
+    do {                                                                  \
+        T B[25], C[5], D[5];                                              \
+        int round;                                                        \
+        for (round = 0; round < 24; round++) {                            \
+            /* Theta */                                                   \
+            C[0] = XOR(XOR(XOR(XOR(A[0], A[5]), A[10]), A[15]), A[20]);   \
+            C[1] = XOR(XOR(XOR(XOR(A[1], A[6]), A[11]), A[16]), A[21]);   \
+            C[2] = XOR(XOR(XOR(XOR(A[2], A[7]), A[12]), A[17]), A[22]);   \
+            C[3] = XOR(XOR(XOR(XOR(A[3], A[8]), A[13]), A[18]), A[23]);   \
+            C[4] = XOR(XOR(XOR(XOR(A[4], A[9]), A[14]), A[19]), A[24]);   \
+            D[0] = XOR(C[4], ROL(C[1], 1));                               \
+            D[1] = XOR(C[0], ROL(C[2], 1));                               \
+            D[2] = XOR(C[1], ROL(C[3], 1));                               \
+            D[3] = XOR(C[2], ROL(C[4], 1));                               \
+            D[4] = XOR(C[3], ROL(C[0], 1));                               \
+            /* Rho + Pi */                                                \
+            B[ 0] = XOR(A[ 0], D[0]);                                     \
+            B[ 1] = ROL(XOR(A[ 6], D[1]), 44);                            \
+            B[ 2] = ROL(XOR(A[12], D[2]), 43);                            \
+            B[ 3] = ROL(XOR(A[18], D[3]), 21);                            \
+            B[ 4] = ROL(XOR(A[24], D[4]), 14);                            \
+            B[ 5] = ROL(XOR(A[ 3], D[3]), 28);                            \
+            B[ 6] = ROL(XOR(A[ 9], D[4]), 20);                            \
+            B[ 7] = ROL(XOR(A[10], D[0]), 3);                             \
+            B[ 8] = ROL(XOR(A[16], D[1]), 45);                            \
+            B[ 9] = ROL(XOR(A[22], D[2]), 61);                            \
+            B[10] = ROL(XOR(A[ 1], D[1]), 1);                             \
+            B[11] = ROL(XOR(A[ 7], D[2]), 6);                             \
+            B[12] = ROL(XOR(A[13], D[3]), 25);                            \
+            B[13] = ROL(XOR(A[19], D[4]), 8);                             \
+            B[14] = ROL(XOR(A[20], D[0]), 18);                            \
+            B[15] = ROL(XOR(A[ 4], D[4]), 27);                            \
+            B[16] = ROL(XOR(A[ 5], D[0]), 36);                            \
+            B[17] = ROL(XOR(A[11], D[1]), 10);                            \
+            B[18] = ROL(XOR(A[17], D[2]), 15);                            \
+            B[19] = ROL(XOR(A[23], D[3]), 56);                            \
+            B[20] = ROL(XOR(A[ 2], D[2]), 62);                            \
+            B[21] = ROL(XOR(A[ 8], D[3]), 55);                            \
+            B[22] = ROL(XOR(A[14], D[4]), 39);                            \
+            B[23] = ROL(XOR(A[15], D[0]), 41);                            \
+            B[24] = ROL(XOR(A[21], D[1]), 2);                             \
+            /* Chi */                                                     \
+            A[ 0] = XOR(B[ 0], ANDN(B[ 1], B[ 2]));                       \
+            A[ 1] = XOR(B[ 1], ANDN(B[ 2], B[ 3]));                       \
+            A[ 2] = XOR(B[ 2], ANDN(B[ 3], B[ 4]));                       \
+            A[ 3] = XOR(B[ 3], ANDN(B[ 4], B[ 0]));                       \
+            A[ 4] = XOR(B[ 4], ANDN(B[ 0], B[ 1]));                       \
+            A[ 5] = XOR(B[ 5], ANDN(B[ 6], B[ 7]));                       \
+            A[ 6] = XOR(B[ 6], ANDN(B[ 7], B[ 8]));                       \
+            A[ 7] = XOR(B[ 7], ANDN(B[ 8], B[ 9]));                       \
+            A[ 8] = XOR(B[ 8], ANDN(B[ 9], B[ 5]));                       \
+            A[ 9] = XOR(B[ 9], ANDN(B[ 5], B[ 6]));                       \
+            A[10] = XOR(B[10], ANDN(B[11], B[12]));                       \
+            A[11] = XOR(B[11], ANDN(B[12], B[13]));                       \
+            A[12] = XOR(B[12], ANDN(B[13], B[14]));                       \
+            A[13] = XOR(B[13], ANDN(B[14], B[10]));                       \
+            A[14] = XOR(B[14], ANDN(B[10], B[11]));                       \
+            A[15] = XOR(B[15], ANDN(B[16], B[17]));                       \
+            A[16] = XOR(B[16], ANDN(B[17], B[18]));                       \
+            A[17] = XOR(B[17], ANDN(B[18], B[19]));                       \
+            A[18] = XOR(B[18], ANDN(B[19], B[15]));                       \
+            A[19] = XOR(B[19], ANDN(B[15], B[16]));                       \
+            A[20] = XOR(B[20], ANDN(B[21], B[22]));                       \
+            A[21] = XOR(B[21], ANDN(B[22], B[23]));                       \
+            A[22] = XOR(B[22], ANDN(B[23], B[24]));                       \
+            A[23] = XOR(B[23], ANDN(B[24], B[20]));                       \
+            A[24] = XOR(B[24], ANDN(B[20], B[21]));                       \
+            /* Iota */                                                    \
+            A[0] = XOR(A[0], RC(round));                                  \
+        }                                                                 \
+    } while (0)
+
+#define XOR(a, b) ((a) ^ (b))
+#define ANDN(a, b) (~(a) & (b))
+#define ROL(x, n) (((x) << (n)) | ((x) >> (64 - (n))))
+#define RC(r) keccakf_rndc[r]
+
+static void keccakf1600(uint64_t A[25])
+{
+    KECCAKF1600_BODY(uint64_t, A);
+}
+
+#undef XOR
+#undef ANDN
+#undef ROL
+#undef RC
+
+// ====================
+// SHA3-256d
+// ====================
+static inline uint64_t load64_le(const uint8_t *p)
+{
+    return (uint64_t)p[0] | ((uint64_t)p[1] << 8) | ((uint64_t)p[2] << 16) |
+           ((uint64_t)p[3] << 24) | ((uint64_t)p[4] << 32) | ((uint64_t)p[5] << 40) |
+           ((uint64_t)p[6] << 48) | ((uint64_t)p[7] << 56);
+}
+
+static inline void store64_le(uint8_t *p, uint64_t v)
+{
+    int i;
+    for (i = 0; i < 8; i++)
+        p[i] = (uint8_t)(v >> (8 * i));
+}
+
+#if defined(__GNUC__) || defined(__clang__)
+#define bswap64(x) __builtin_bswap64(x)
+#else
+static inline uint64_t bswap64(uint64_t x)
+{
+    x = ((x & 0x00FF00FF00FF00FFULL) << 8) | ((x >> 8) & 0x00FF00FF00FF00FFULL);
+    x = ((x & 0x0000FFFF0000FFFFULL) << 16) | ((x >> 16) & 0x0000FFFF0000FFFFULL);
+    return (x << 32) | (x >> 32);
+}
+#endif
+
+static inline uint64_t load64_be(const uint8_t *p)
+{
+    return bswap64(load64_le(p));
+}
+
+/*
+ * Digest <= target. The digest is given as its four little-endian Keccak
+ * lanes, `stride` apart; the target as four big-endian words, most
+ * significant first. The top 64 bits decide almost every nonce, so the
+ * remaining lanes are only read on a tie.
+ */
+static inline int lanes_meet_target(const uint64_t *lanes, int stride, const uint64_t target[DIGEST_SIZE / 8])
+{
+    int i;
+    for (i = 0; i < DIGEST_SIZE / 8; i++) {
+        uint64_t d = bswap64(lanes[i * stride]);
+        if (d != target[i])
+            return d < target[i];
+    }
+    return 1;
+}
+
+// Outer hash: SHA3-256 of the first digest in st[0..3], in place
+static inline void sha3_256_rehash(uint64_t st[25])
+{
+    int i;
+
+    st[DIGEST_SIZE / 8] = PAD_FIRST;
+    for (i = DIGEST_SIZE / 8 + 1; i < 25; i++)
+        st[i] = 0;
+    st[SHA3_256_RATE / 8 - 1] = PAD_LAST;
+    keccakf1600(st);
+}
+
+/*
+ * Double SHA3-256 of a 40-byte message given as five little-endian lanes.
+ * Both messages fit in one rate block, so absorbing is a lane copy and the
+ * padding is constant. The first digest stays in lanes 0..3 for the outer
+ * hash; the final digest is left in st[0..3].
+ */
+static inline void sha3_256d_40_lanes(const uint64_t msg[INPUT_SIZE / 8], uint64_t st[25])
+{
+    int i;
+
+    // Inner hash: header_hash || nonce + padding
+    for (i = 0; i < INPUT_SIZE / 8; i++)
+        st[i] = msg[i];
+    st[INPUT_SIZE / 8] = PAD_FIRST;
+    for (i = INPUT_SIZE / 8 + 1; i < 25; i++)
+        st[i] = 0;
+    st[SHA3_256_RATE / 8 - 1] = PAD_LAST;
+    keccakf1600(st);
+
+    sha3_256_rehash(st);
+}
+
+/*
+ * Inner sponge state for header_hash || nonce after absorbing and padding,
+ * with the nonce lane left zero. It is the same for every nonce of a
+ * template, so the search loop copies it and only stores the nonce.
+ */
+static void sha3_256d_40_base(const uint8_t header_hash[HEADER_HASH_SIZE], uint64_t base[25])
+{
+    int i;
+
+    for (i = 0; i < 25; i++)
+        base[i] = 0;
+    for (i = 0; i < HEADER_HASH_SIZE / 8; i++)
+        base[i] = load64_le(header_hash + 8 * i);
+    base[INPUT_SIZE / 8] = PAD_FIRST;
+    base[SHA3_256_RATE / 8 - 1] = PAD_LAST;
+}
+
+static void sha3_256d_40(const uint8_t in[INPUT_SIZE], uint8_t out[DIGEST_SIZE])
+{
+    uint64_t msg[INPUT_SIZE / 8], st[25];
+    int i;
+
+    for (i = 0; i < INPUT_SIZE / 8; i++)
+        msg[i] = load64_le(in + 8 * i);
+    sha3_256d_40_lanes(msg, st);
+    for (i = 0; i < DIGEST_SIZE / 8; i++)
+        store64_le(out + 8 * i, st[i]);
+}
+
+// ====================
+// SIMD KECCAK-F[1600]
+// ====================
+#ifdef HAVE_X86_SIMD
+#define XOR(a, b) _mm256_xor_si256((a), (b))
+#define ANDN(a, b) _mm256_andnot_si256((a), (b))
+#define ROL(x, n) _mm256_or_si256(_mm256_slli_epi64((x), (n)), _mm256_srli_epi64((x), 64 - (n)))
+#define RC(r) _mm256_set1_epi64x((long long)keccakf_rndc[r])
+
+#ifndef HAVE_XKCP
+// Four interleaved Keccak-f[1600] permutations, one sponge per 64-bit lane
+TARGET_AVX2 static void keccakf1600_x4_avx2(__m256i A[25])
+{
+    KECCAKF1600_BODY(__m256i, A);
+}
+#endif
+
+#undef XOR
+#undef ANDN
+#undef ROL
+#undef RC
+
+#define XOR(a, b) _mm512_xor_si512((a), (b))
+#define ANDN(a, b) _mm512_andnot_si512((a), (b))
+#define ROL(x, n) _mm512_rol_epi64((x), (n))
+#define RC(r) _mm512_set1_epi64((long long)keccakf_rndc[r])
+
+// Eight interleaved Keccak-f[1600] permutations, one sponge per 64-bit lane
+TARGET_AVX512 static void keccakf1600_x8_avx512(__m512i A[25])
+{
+    KECCAKF1600_BODY(__m512i, A);
+}
+
+#undef XOR
+#undef ANDN
+#undef ROL
+#undef RC
+#endif  // HAVE_X86_SIMD
+
+// ====================
+// 4-WAY SHA3-256d
+// ====================
+// Set at import time from the CPU feature flags
+static int simd_lanes = 1;
+static int cpu_has_avx2 = 0;
+
+#ifdef HAVE_XKCP
+/*
+ * Double SHA3-256 of four 40-byte inputs through XKCP's
+ * KeccakP1600times4_PermuteAll_24rounds. Lanes are exchanged with XKCP in
+ * instance-major order, 17 rate lanes per instance.
+ */
+static void sha3_256d_40_x4(const uint8_t in[4 * INPUT_SIZE], uint8_t out[4 * DIGEST_SIZE])
+{
+    uint64_t states[4 * 25] __attribute__((aligned(64)));
+    uint64_t block[4][SHA3_256_RATE / 8];
+    uint64_t lanes[4][DIGEST_SIZE / 8];
+    int i, j;
+
+    // Inner hash: input + padding
+    memset(block, 0, sizeof(block));
+    for (j = 0; j < 4; j++) {
+        for (i = 0; i < INPUT_SIZE / 8; i++)
+            block[j][i] = load64_le(in + INPUT_SIZE * j + 8 * i);
+        block[j][INPUT_SIZE / 8] = PAD_FIRST;
+        block[j][SHA3_256_RATE / 8 - 1] = PAD_LAST;
+    }
+    KeccakP1600times4_InitializeAll(states);
+    KeccakP1600times4_AddLanesAll(states, (const unsigned char *)block, SHA3_256_RATE / 8, SHA3_256_RATE / 8);
+    KeccakP1600times4_PermuteAll_24rounds(states);
+    KeccakP1600times4_ExtractLanesAll(states, (unsigned char *)lanes, DIGEST_SIZE / 8, DIGEST_SIZE / 8);
+
+    // Outer hash: first digest + padding
+    memset(block, 0, sizeof(block));
+    for (j = 0; j < 4; j++) {
+        for (i = 0; i < DIGEST_SIZE / 8; i++)
+            block[j][i] = lanes[j][i];
+        block[j][DIGEST_SIZE / 8] = PAD_FIRST;
+        block[j][SHA3_256_RATE / 8 - 1] = PAD_LAST;
+    }
+    KeccakP1600times4_InitializeAll(states);
+    KeccakP1600times4_AddLanesAll(states, (const unsigned char *)block, SHA3_256_RATE / 8, SHA3_256_RATE / 8);
+    KeccakP1600times4_PermuteAll_24rounds(states);
+    KeccakP1600times4_ExtractLanesAll(states, (unsigned char *)lanes, DIGEST_SIZE / 8, DIGEST_SIZE / 8);
+
+    for (j = 0; j < 4; j++)
+        for (i = 0; i < DIGEST_SIZE / 8; i++)
+            store64_le(out + DIGEST_SIZE * j + 8 * i, lanes[j][i]);
+}
+#else
+#ifdef HAVE_X86_SIMD
+TARGET_AVX2 static void sha3_256d_40_x4_avx2(const uint8_t in[4 * INPUT_SIZE], uint8_t out[4 * DIGEST_SIZE])
+{
+    __m256i A[25];
+    uint64_t rows[4 * 4];
+    int i, j;
+
+    // Inner hash: input + padding
+    for (i = 0; i < INPUT_SIZE / 8; i++)
+        A[i] = _mm256_set_epi64x((long long)load64_le(in + 3 * INPUT_SIZE + 8 * i),
+                                 (long long)load64_le(in + 2 * INPUT_SIZE + 8 * i),
+                                 (long long)load64_le(in + 1 * INPUT_SIZE + 8 * i),
+                                 (long long)load64_le(in + 8 * i));
+    A[5] = _mm256_set1_epi64x((long long)PAD_FIRST);
+    for (i = 6; i < 25; i++)
+        A[i] = _mm256_setzero_si256();
+    A[16] = _mm256_set1_epi64x((long long)PAD_LAST);
+    keccakf1600_x4_avx2(A);
+
+    // Outer hash: first digest (lanes 0..3) + padding
+    A[4] = _mm256_set1_epi64x((long long)PAD_FIRST);
+    for (i = 5; i < 25; i++)
+        A[i] = _mm256_setzero_si256();
+    A[16] = _mm256_set1_epi64x((long long)PAD_LAST);
+    keccakf1600_x4_avx2(A);
+
+    for (i = 0; i < 4; i++)
+        _mm256_storeu_si256((__m256i *)(rows + 4 * i), A[i]);
+    for (j = 0; j < 4; j++)
+        for (i = 0; i < DIGEST_SIZE / 8; i++)
+            store64_le(out + DIGEST_SIZE * j + 8 * i, rows[4 * i + j]);
+}
+#endif  // HAVE_X86_SIMD
+
+// Double SHA3-256 of four 40-byte inputs, AVX2 when available
+static void sha3_256d_40_x4(const uint8_t in[4 * INPUT_SIZE], uint8_t out[4 * DIGEST_SIZE])
+{
+    int j;
+
+#ifdef HAVE_X86_SIMD
+    if (cpu_has_avx2) {
+        sha3_256d_40_x4_avx2(in, out);
+        return;
+    }
+#endif
+    for (j = 0; j < 4; j++)
+        sha3_256d_40(in + INPUT_SIZE * j, out + DIGEST_SIZE * j);
+}
+#endif  // HAVE_XKCP
+
+// ====================
+// MINING KERNEL
+// ====================
+static int search_nonces(const uint8_t header_hash[HEADER_HASH_SIZE],
+                         const uint64_t target[DIGEST_SIZE / 8],
+                         uint64_t start_nonce, Py_ssize_t count,
+                         uint64_t *found)
+{
+    uint64_t base[25], st[25];
+    uint64_t nonce = start_nonce;
+    Py_ssize_t i;
+
+    sha3_256d_40_base(header_hash, base);
+
+    for (i = 0; i < count; i++, nonce++) {
+        memcpy(st, base, sizeof(st));
+        st[HEADER_HASH_SIZE / 8] = nonce;
+        keccakf1600(st);
+        sha3_256_rehash(st);
+
+        if (lanes_meet_target(st, 1, target)) {
+            *found = nonce;
+            return 1;
+        }
+    }
+    return 0;
+}
+
+#ifdef HAVE_X86_SIMD
+/*
+ * header_hash as SoA rows: header lane i repeated across all `lanes` sponges
+ * at rows[i * lanes], so each row is a single aligned vector load. Built once
+ * per batch instead of broadcasting from the bytes in every group.
+ */
+static void broadcast_header(const uint8_t header_hash[HEADER_HASH_SIZE], int lanes, uint64_t *rows)
+{
+    int i, j;
+
+    for (i = 0; i < HEADER_HASH_SIZE / 8; i++) {
+        uint64_t w = load64_le(header_hash + 8 * i);
+        for (j = 0; j < lanes; j++)
+            rows[i * lanes + j] = w;
+    }
+}
+
+/*
+ * Check the digests of `lanes` interleaved sponges (SoA lanes 0..3, one
+ * uint64_t row per lane) in nonce order. Only the sponges set in
+ * `candidates` passed the vector top-word compare; the rest are skipped.
+ */
+static int check_digests(const uint64_t *rows, int lanes, unsigned candidates,
+                         const uint64_t target[DIGEST_SIZE / 8],
+                         uint64_t nonce, uint64_t *found)
+{
+    int j;
+
+    for (j = 0; j < lanes; j++) {
+        if (((candidates >> j) & 1) && lanes_meet_target(rows + j, lanes, target)) {
+            *found = nonce + j;
+            return 1;
+        }
+    }
+    return 0;
+}
+
+#ifndef HAVE_XKCP
+TARGET_AVX2 static int search_nonces_x4(const uint8_t header_hash[HEADER_HASH_SIZE],
+                                        const uint64_t target[DIGEST_SIZE / 8],
+                                        uint64_t nonce, Py_ssize_t groups,
+                                        uint64_t *found)
+{
+    // Byte swap within each 64-bit lane; XOR with the sign bit turns the signed compare unsigned
+    const __m256i bswap = _mm256_setr_epi8(7, 6, 5, 4, 3, 2, 1, 0, 15, 14, 13, 12, 11, 10, 9, 8,
+                                           7, 6, 5, 4, 3, 2, 1, 0, 15, 14, 13, 12, 11, 10, 9, 8);
+    const __m256i sign = _mm256_set1_epi64x((long long)0x8000000000000000ULL);
+    const __m256i target_top = _mm256_xor_si256(_mm256_set1_epi64x((long long)target[0]), sign);
+    const __m256i step = _mm256_set1_epi64x(4);
+    __m256i nonces = _mm256_add_epi64(_mm256_set1_epi64x((long long)nonce), _mm256_set_epi64x(3, 2, 1, 0));
+    __m256i A[25], top;
+    unsigned candidates;
+    ALIGN64 uint64_t header_lanes[HEADER_HASH_SIZE / 8 * 4];
+    ALIGN64 uint64_t rows[4 * 4];
+    Py_ssize_t g;
+    int i;
+
+    broadcast_header(header_hash, 4, header_lanes);
+
+    for (g = 0; g < groups; g++, nonce += 4) {
+        // Inner hash: header_hash || nonce (40 bytes) + padding
+        for (i = 0; i < HEADER_HASH_SIZE / 8; i++)
+            A[i] = _mm256_load_si256((const __m256i *)(header_lanes + 4 * i));
+        A[4] = nonces;
+        nonces = _mm256_add_epi64(nonces, step);
+        A[5] = _mm256_set1_epi64x((long long)PAD_FIRST);
+        for (i = 6; i < 25; i++)
+            A[i] = _mm256_setzero_si256();
+        A[16] = _mm256_set1_epi64x((long long)PAD_LAST);
+        keccakf1600_x4_avx2(A);
+
+        // Outer hash: first digest (lanes 0..3) + padding
+        A[4] = _mm256_set1_epi64x((long long)PAD_FIRST);
+        for (i = 5; i < 25; i++)
+            A[i] = _mm256_setzero_si256();
+        A[16] = _mm256_set1_epi64x((long long)PAD_LAST);
+        keccakf1600_x4_avx2(A);
+
+        // Branchless early reject: skip the group when every digest's top 64 bits exceed the target's
+        top = _mm256_xor_si256(_mm256_shuffle_epi8(A[0], bswap), sign);
+        candidates = ~_mm256_movemask_pd(_mm256_castsi256_pd(_mm256_cmpgt_epi64(top, target_top))) & 0xF;
+        if (!candidates)
+            continue;
+
+        for (i = 0; i < 4; i++)
+            _mm256_store_si256((__m256i *)(rows + 4 * i), A[i]);
+        if (check_digests(rows, 4, candidates, target, nonce, found))
+            return 1;
+    }
+    return 0;
+}
+
+#endif  // !HAVE_XKCP
+
+TARGET_AVX512 static int search_nonces_x8(const uint8_t header_hash[HEADER_HASH_SIZE],
+                                          const uint64_t target[DIGEST_SIZE / 8],
+                                          uint64_t nonce, Py_ssize_t groups,
+                                          uint64_t *found)
+{
+    // Byte swap within each 64-bit lane
+    const __m512i bswap = _mm512_set_epi64(
+        0x08090a0b0c0d0e0fLL, 0x0001020304050607LL, 0x08090a0b0c0d0e0fLL, 0x0001020304050607LL,
+        0x08090a0b0c0d0e0fLL, 0x0001020304050607LL, 0x08090a0b0c0d0e0fLL, 0x0001020304050607LL);
+    const __m512i target_top = _mm512_set1_epi64((long long)target[0]);
+    const __m512i step = _mm512_set1_epi64(8);
+    __m512i nonces = _mm512_add_epi64(_mm512_set1_epi64((long long)nonce),
+                                      _mm512_set_epi64(7, 6, 5, 4, 3, 2, 1, 0));
+    __m512i A[25];
+    __mmask8 candidates;
+    ALIGN64 uint64_t header_lanes[HEADER_HASH_SIZE / 8 * 8];
+    ALIGN64 uint64_t rows[4 * 8];
+    Py_ssize_t g;
+    int i;
+
+    broadcast_header(header_hash, 8, header_lanes);
+
+    for (g = 0; g < groups; g++, nonce += 8) {
+        // Inner hash: header_hash || nonce (40 bytes) + padding
+        for (i = 0; i < HEADER_HASH_SIZE / 8; i++)
+            A[i] = _mm512_load_si512((const void *)(header_lanes + 8 * i));
+        A[4] = nonces;
+        nonces = _mm512_add_epi64(nonces, step);
+        A[5] = _mm512_set1_epi64((long long)PAD_FIRST);
+        for (i = 6; i < 25; i++)
+            A[i] = _mm512_setzero_si512();
+        A[16] = _mm512_set1_epi64((long long)PAD_LAST);
+        keccakf1600_x8_avx512(A);
+
+        // Outer hash: first digest (lanes 0..3) + padding
+        A[4] = _mm512_set1_epi64((long long)PAD_FIRST);
+        for (i = 5; i < 25; i++)
+            A[i] = _mm512_setzero_si512();
+        A[16] = _mm512_set1_epi64((long long)PAD_LAST);
+        keccakf1600_x8_avx512(A);
+
+        // Branchless early reject: skip the group when every digest's top 64 bits exceed the target's
+        candidates = _mm512_cmple_epu64_mask(_mm512_shuffle_epi8(A[0], bswap), target_top);
+        if (!candidates)
+            continue;
+
+        for (i = 0; i < 4; i++)
+            _mm512_store_si512((void *)(rows + 8 * i), A[i]);
+        if (check_digests(rows, 8, candidates, target, nonce, found))
+            return 1;
+    }
+    return 0;
+}
+#endif  // HAVE_X86_SIMD
+
+#ifdef HAVE_XKCP
+static int search_nonces_x4_xkcp(const uint8_t header_hash[HEADER_HASH_SIZE],
+                                 const uint64_t target[DIGEST_SIZE / 8],
+                                 uint64_t nonce, Py_ssize_t groups,
+                                 uint64_t *found)
+{
+    uint8_t in[4 * INPUT_SIZE];
+    uint8_t out[4 * DIGEST_SIZE];
+    uint64_t lanes[DIGEST_SIZE / 8];
+    Py_ssize_t g;
+    int i, j;
+
+    for (j = 0; j < 4; j++)
+        memcpy(in + INPUT_SIZE * j, header_hash, HEADER_HASH_SIZE);
+
+    for (g = 0; g < groups; g++, nonce += 4) {
+        for (j = 0; j < 4; j++)
+            store64_le(in + INPUT_SIZE * j + HEADER_HASH_SIZE, nonce + j);
+        sha3_256d_40_x4(in, out);
+        for (j = 0; j < 4; j++) {
+            for (i = 0; i < DIGEST_SIZE / 8; i++)
+                lanes[i] = load64_le(out + DIGEST_SIZE * j + 8 * i);
+            if (lanes_meet_target(lanes, 1, target)) {
+                *found = nonce + j;
+                return 1;
+            }
+        }
+    }
+    return 0;
+}
+#endif  // HAVE_XKCP
+
+static int search_nonces_dispatch(const uint8_t header_hash[HEADER_HASH_SIZE],
+                                  const uint64_t target[DIGEST_SIZE / 8],
+                                  uint64_t nonce, Py_ssize_t count,
+                                  uint64_t *found)
+{
+    Py_ssize_t groups = simd_lanes > 1 ? count / simd_lanes : 0;
+    int hit = 0;
+
+#ifdef HAVE_X86_SIMD
+    if (simd_lanes == 8)
+        hit = search_nonces_x8(header_hash, target, nonce, groups, found);
+#endif
+#if defined(HAVE_XKCP)
+    if (simd_lanes == 4)
+        hit = search_nonces_x4_xkcp(header_hash, target, nonce, groups, found);
+#elif defined(HAVE_X86_SIMD)
+    if (simd_lanes == 4)
+        hit = search_nonces_x4(header_hash, target, nonce, groups, found);
+#endif
+    if (hit)
+        return 1;
+    nonce += (uint64_t)(groups * simd_lanes);
+    count -= groups * simd_lanes;
+
+    // Scalar tail
+    return search_nonces(header_hash, target, nonce, count, found);
+}
+
+/*
+ * search_nonces_dispatch in CANCEL_CHECK_INTERVAL steps, giving up once the
+ * word at `cancel` (if any) no longer holds `generation`. Lets the caller
+ * abandon a batch from another thread or process without a lock. The
+ * number of nonces actually hashed, up to and including a hit, is stored
+ * in *hashed.
+ */
+static int search_nonces_cancellable(const uint8_t header_hash[HEADER_HASH_SIZE],
+                                     const uint64_t target[DIGEST_SIZE / 8],
+                                     uint64_t nonce, Py_ssize_t count,
+                                     const volatile uint64_t *cancel, uint64_t generation,
+                                     uint64_t *found, Py_ssize_t *hashed)
+{
+    Py_ssize_t n;
+
+    *hashed = 0;
+    while (count > 0) {
+        if (cancel && *cancel != generation)
+            return 0;
+        n = count < CANCEL_CHECK_INTERVAL ? count : CANCEL_CHECK_INTERVAL;
+        if (search_nonces_dispatch(header_hash, target, nonce, n, found)) {
+            *hashed += (Py_ssize_t)(*found - nonce) + 1;
+            return 1;
+        }
+        *hashed += n;
+        nonce += (uint64_t)n;
+        count -= n;
+    }
+    return 0;
+}
+
+static PyObject *
+miner_mine_batch(PyObject *self, PyObject *args)
+{
+    Py_buffer header, target, cancel = {0};
+    unsigned long long start_nonce, generation = 0;
+    Py_ssize_t count, hashed;
+    uint64_t target_words[DIGEST_SIZE / 8];
+    uint64_t found = 0;
+    int hit, cancellable, i;
+
+    if (!PyArg_ParseTuple(args, "y*y*Kn|y*K:mine_batch", &header, &target, &start_nonce, &count,
+                          &cancel, &generation))
+        return NULL;
+
+    if (header.len != HEADER_HASH_SIZE || target.len != DIGEST_SIZE) {
+        PyErr_Format(PyExc_ValueError, "header_hash and target must be %d bytes", DIGEST_SIZE);
+        goto error;
+    }
+    if (cancel.obj != NULL && cancel.len != sizeof(uint64_t)) {
+        PyErr_SetString(PyExc_ValueError, "cancel must be an 8-byte buffer");
+        goto error;
+    }
+
+    for (i = 0; i < DIGEST_SIZE / 8; i++)
+        target_words[i] = load64_be((const uint8_t *)target.buf + 8 * i);
+
+    Py_BEGIN_ALLOW_THREADS
+    hit = search_nonces_cancellable(header.buf, target_words, (uint64_t)start_nonce, count,
+                                    cancel.buf, (uint64_t)generation, &found, &hashed);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&header);
+    PyBuffer_Release(&target);
+    cancellable = cancel.obj != NULL;
+    if (cancellable)
+        PyBuffer_Release(&cancel);
+
+    // A cancelled batch stops early, so the caller also needs the hash count
+    if (cancellable) {
+        if (!hit)
+            return Py_BuildValue("(On)", Py_None, hashed);
+        return Py_BuildValue("(Kn)", (unsigned long long)found, hashed);
+    }
+    if (!hit)
+        Py_RETURN_NONE;
+    return PyLong_FromUnsignedLongLong(found);
+
+error:
+    PyBuffer_Release(&header);
+    PyBuffer_Release(&target);
+    if (cancel.obj != NULL)
+        PyBuffer_Release(&cancel);
+    return NULL;
+}
+
+static PyObject *
+miner_sha3_256d_40(PyObject *self, PyObject *args)
+{
+    Py_buffer data;
+    PyObject *result;
+
+    if (!PyArg_ParseTuple(args, "y*:sha3_256d_40", &data))
+        return NULL;
+
+    if (data.len != INPUT_SIZE) {
+        PyBuffer_Release(&data);
+        PyErr_Format(PyExc_ValueError, "data must be %d bytes (header_hash || nonce)", INPUT_SIZE);
+        return NULL;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, DIGEST_SIZE);
+    if (result != NULL)
+        sha3_256d_40(data.buf, (uint8_t *)PyBytes_AS_STRING(result));
+
+    PyBuffer_Release(&data);
+    return result;
+}
+
+static PyObject *
+miner_sha3_256d_x4(PyObject *self, PyObject *args)
+{
+    Py_buffer inputs;
+    PyObject *result;
+
+    if (!PyArg_ParseTuple(args, "y*:sha3_256d_x4", &inputs))
+        return NULL;
+
+    if (inputs.len != 4 * INPUT_SIZE) {
+        PyBuffer_Release(&inputs);
+        PyErr_Format(PyExc_ValueError, "inputs must be 4 concatenated %d-byte messages", INPUT_SIZE);
+        return NULL;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, 4 * DIGEST_SIZE);
+    if (result != NULL)
+        sha3_256d_40_x4(inputs.buf, (uint8_t *)PyBytes_AS_STRING(result));
+
+    PyBuffer_Release(&inputs);
+    return result;
+}
+
+static PyMethodDef miner_methods[] = {
+    {"mine_batch", miner_mine_batch, METH_VARARGS,
+     "mine_batch(header_hash, target_bytes, start_nonce, count[, cancel, generation]) -> int | None\n\n"
+     "Search count nonces from start_nonce for a SHA3-256d hash <= target_bytes\n"
+     "(32-byte big-endian, i.e. (MAX_TARGET // difficulty).to_bytes(32, \"big\")).\n"
+     "Returns the first matching nonce, or None if the batch had no hit.\n"
+     "If cancel is given (an 8-byte buffer such as a shared ctypes c_uint64), the\n"
+     "search gives up early once it no longer holds generation, and the result\n"
+     "is a (nonce | None, hashed) tuple with the number of nonces hashed."},
+    {"sha3_256d_40", miner_sha3_256d_40, METH_VARARGS,
+     "sha3_256d_40(data) -> bytes\n\n"
+     "Double SHA3-256 of a 40-byte message (header_hash || nonce)."},
+    {"sha3_256d_x4", miner_sha3_256d_x4, METH_VARARGS,
+     "sha3_256d_x4(inputs) -> bytes\n\n"
+     "Double SHA3-256 of four concatenated 40-byte messages (header_hash || nonce),\n"
+     "hashed in one 4-way Keccak pass. Returns the four 32-byte digests concatenated."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef miner_module = {
+    PyModuleDef_HEAD_INIT,
+    "_miner",
+    "Native SHA3-256d mining kernel",
+    -1,
+    miner_methods
+};
+
+PyMODINIT_FUNC
+PyInit__miner(void)
+{
+    PyObject *module = PyModule_Create(&miner_module);
+    if (module == NULL)
+        return NULL;
+
+#ifdef HAVE_X86_SIMD
+    __builtin_cpu_init();
+    cpu_has_avx2 = __builtin_cpu_supports("avx2");
+    if (__builtin_cpu_supports("avx512f") && __builtin_cpu_supports("avx512bw"))
+        simd_lanes = 8;
+    else if (cpu_has_avx2)
+        simd_lanes = 4;
+#endif
+#ifdef HAVE_XKCP
+    // XKCP was built for this machine's times4 target
+    if (simd_lanes < 4)
+        simd_lanes = 4;
+#endif
+
+    if (PyModule_AddIntConstant(module, "HAVE_XKCP", XKCP_ENABLED) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+    if (PyModule_AddIntConstant(module, "SIMD_LANES", simd_lanes) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+    return module;
+}
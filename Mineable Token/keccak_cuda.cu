@@ -0,0 +1,156 @@
+/*
+ * CUDA SHA3-256d search kernel for the XELIS contract miner.
+ *
+ * Loaded and launched through CuPy by keccak_cuda.py: one thread per
+ * candidate nonce, header_hash shared through constant memory.
+ */
+typedef unsigned int u32;
+typedef unsigned long long u64;
+
+// SHA3 padding lanes: 0x06 after the message, 0x80 in the last rate byte
+#define PAD_FIRST 0x06ULL
+#define PAD_LAST 0x8000000000000000ULL
+
+// header_hash as four little-endian lanes, uploaded once per template
+__constant__ u64 c_header_hash[4];
+
+__constant__ u64 c_round_constants[24] = {
+    0x0000000000000001ULL, 0x0000000000008082ULL, 0x800000000000808aULL,
+    0x8000000080008000ULL, 0x000000000000808bULL, 0x0000000080000001ULL,
+    0x8000000080008081ULL, 0x8000000000008009ULL, 0x000000000000008aULL,
+    0x0000000000000088ULL, 0x0000000080008009ULL, 0x000000008000000aULL,
+    0x000000008000808bULL, 0x800000000000008bULL, 0x8000000000008089ULL,
+    0x8000000000008003ULL, 0x8000000000008002ULL, 0x8000000000000080ULL,
+    0x000000000000800aULL, 0x800000008000000aULL, 0x8000000080008081ULL,
+    0x8000000000008080ULL, 0x0000000080000001ULL, 0x8000000080008008ULL
+};
+
+// 64-bit rotate from two 32-bit funnel shifts; n is a constant after unrolling
+__device__ __forceinline__ u64 rotl64(u64 x, int n)
+{
+    u32 lo = (u32)x;
+    u32 hi = (u32)(x >> 32);
+
+    if (n >= 32) {
+        u32 t = lo;
+        lo = hi;
+        hi = t;
+        n -= 32;
+    }
+    return ((u64)__funnelshift_l(lo, hi, n) << 32) | __funnelshift_l(hi, lo, n);
+}
+
+__device__ __forceinline__ u64 bswap64(u64 x)
+{
+    u32 lo = __byte_perm((u32)x, 0, 0x0123);
+    u32 hi = __byte_perm((u32)(x >> 32), 0, 0x0123);
+    return ((u64)lo << 32) | hi;
+}
+
+__device__ __forceinline__ void keccak_f1600(u64 A[25])
+{
+    u64 B[25], C[5], D[5];
+
+#pragma unroll
+    for (int round = 0; round < 24; round++) {
+        // Theta
+        C[0] = A[0] ^ A[5] ^ A[10] ^ A[15] ^ A[20];
+        C[1] = A[1] ^ A[6] ^ A[11] ^ A[16] ^ A[21];
+        C[2] = A[2] ^ A[7] ^ A[12] ^ A[17] ^ A[22];
+        C[3] = A[3] ^ A[8] ^ A[13] ^ A[18] ^ A[23];
+        C[4] = A[4] ^ A[9] ^ A[14] ^ A[19] ^ A[24];
+        D[0] = C[4] ^ rotl64(C[1], 1);
+        D[1] = C[0] ^ rotl64(C[2], 1);
+        D[2] = C[1] ^ rotl64(C[3], 1);
+        D[3] = C[2] ^ rotl64(C[4], 1);
+        D[4] = C[3] ^ rotl64(C[0], 1);
+
+        // Rho + Pi
+        B[ 0] = A[ 0] ^ D[0];
+        B[ 1] = rotl64(A[ 6] ^ D[1], 44);
+        B[ 2] = rotl64(A[12] ^ D[2], 43);
+        B[ 3] = rotl64(A[18] ^ D[3], 21);
+        B[ 4] = rotl64(A[24] ^ D[4], 14);
+        B[ 5] = rotl64(A[ 3] ^ D[3], 28);
+        B[ 6] = rotl64(A[ 9] ^ D[4], 20);
+        B[ 7] = rotl64(A[10] ^ D[0], 3);
+        B[ 8] = rotl64(A[16] ^ D[1], 45);
+        B[ 9] = rotl64(A[22] ^ D[2], 61);
+        B[10] = rotl64(A[ 1] ^ D[1], 1);
+        B[11] = rotl64(A[ 7] ^ D[2], 6);
+        B[12] = rotl64(A[13] ^ D[3], 25);
+        B[13] = rotl64(A[19] ^ D[4], 8);
+        B[14] = rotl64(A[20] ^ D[0], 18);
+        B[15] = rotl64(A[ 4] ^ D[4], 27);
+        B[16] = rotl64(A[ 5] ^ D[0], 36);
+        B[17] = rotl64(A[11] ^ D[1], 10);
+        B[18] = rotl64(A[17] ^ D[2], 15);
+        B[19] = rotl64(A[23] ^ D[3], 56);
+        B[20] = rotl64(A[ 2] ^ D[2], 62);
+        B[21] = rotl64(A[ 8] ^ D[3], 55);
+        B[22] = rotl64(A[14] ^ D[4], 39);
+        B[23] = rotl64(A[15] ^ D[0], 41);
+        B[24] = rotl64(A[21] ^ D[1], 2);
+
+        // Chi
+#pragma unroll
+        for (int y = 0; y < 25; y += 5) {
+            A[y + 0] = B[y + 0] ^ (~B[y + 1] & B[y + 2]);
+            A[y + 1] = B[y + 1] ^ (~B[y + 2] & B[y + 3]);
+            A[y + 2] = B[y + 2] ^ (~B[y + 3] & B[y + 4]);
+            A[y + 3] = B[y + 3] ^ (~B[y + 4] & B[y + 0]);
+            A[y + 4] = B[y + 4] ^ (~B[y + 0] & B[y + 1]);
+        }
+
+        // Iota
+        A[0] ^= c_round_constants[round];
+    }
+}
+
+/*
+ * Hash nonces [start_nonce, start_nonce + count). target is the PoW target
+ * as four big-endian 64-bit words; found[0] is set to 1 and found[1] to the
+ * nonce by the first thread that meets it.
+ */
+extern "C" __global__ void mine_kernel(const u64 *target, u64 start_nonce, u64 count, u64 *found)
+{
+    u64 idx = (u64)blockIdx.x * blockDim.x + threadIdx.x;
+    u64 A[25];
+
+    if (idx >= count)
+        return;
+
+    // Inner hash: header_hash || nonce (40 bytes) + padding
+#pragma unroll
+    for (int i = 0; i < 25; i++)
+        A[i] = 0;
+    A[0] = c_header_hash[0];
+    A[1] = c_header_hash[1];
+    A[2] = c_header_hash[2];
+    A[3] = c_header_hash[3];
+    A[4] = start_nonce + idx;
+    A[5] = PAD_FIRST;
+    A[16] = PAD_LAST;
+    keccak_f1600(A);
+
+    // Outer hash: first digest (lanes 0..3) + padding
+#pragma unroll
+    for (int i = 5; i < 25; i++)
+        A[i] = 0;
+    A[4] = PAD_FIRST;
+    A[16] = PAD_LAST;
+    keccak_f1600(A);
+
+    // Top 64 bits decide almost every nonce; compare the rest only on a tie
+#pragma unroll
+    for (int w = 0; w < 4; w++) {
+        u64 d = bswap64(A[w]);
+        if (d > target[w])
+            return;
+        if (d < target[w])
+            break;
+    }
+
+    if (atomicCAS(&found[0], 0ULL, 1ULL) == 0ULL)
+        found[1] = start_nonce + idx;
+}
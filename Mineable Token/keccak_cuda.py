@@ -0,0 +1,51 @@
+"""
+CUDA SHA3-256d mining kernel.
+
+Compiles keccak_cuda.cu with CuPy (pip install cupy-cuda12x) and exposes the
+same mine_batch() interface as the _miner extension. Enabled with --gpu.
+"""
+import os
+
+import cupy as cp
+import numpy as np
+
+THREADS_PER_BLOCK = 256
+
+_source_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keccak_cuda.cu")
+with open(_source_path) as f:
+    _module = cp.RawModule(code=f.read())
+
+_mine_kernel = _module.get_function("mine_kernel")
+_header_hash = cp.ndarray((4,), dtype=cp.uint64, memptr=_module.get_global("c_header_hash"))
+_found = cp.zeros(2, dtype=cp.uint64)
+_last_header = None
+
+
+def device_name() -> str:
+    props = cp.cuda.runtime.getDeviceProperties(cp.cuda.Device().id)
+    return props["name"].decode()
+
+
+def mine_batch(header_hash: bytes, target_bytes: bytes, start_nonce: int, count: int):
+    """CUDA equivalent of _miner.mine_batch"""
+    global _last_header
+
+    # Constant memory only changes with the template
+    if header_hash != _last_header:
+        _header_hash.set(np.frombuffer(header_hash, dtype="<u8").astype(np.uint64))
+        _last_header = header_hash
+
+    target_words = cp.asarray(np.frombuffer(target_bytes, dtype=">u8").astype(np.uint64))
+    _found.fill(0)
+
+    blocks = (count + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+    _mine_kernel(
+        (blocks,),
+        (THREADS_PER_BLOCK,),
+        (target_words, np.uint64(start_nonce), np.uint64(count), _found)
+    )
+
+    found = _found.get()
+    if not found[0]:
+        return None
+    return int(found[1])
@@ -0,0 +1,147 @@
+"""
+Numba SHA3-256d mining kernel.
+
+JIT fallback for machines that cannot build the _miner C extension
+(pip install numba). Exposes the same mine_batch() interface; each batch is
+split into independent nonce ranges hashed in parallel without the GIL.
+"""
+import numpy as np
+from numba import njit, prange, uint64, get_num_threads
+
+# ====================
+# KECCAK-F[1600]
+# ====================
+ROUND_CONSTANTS = np.array([
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+], dtype=np.uint64)
+
+ROTATIONS = np.array([
+    1, 3, 6, 10, 15, 21, 28, 36, 45, 55, 2, 14,
+    27, 41, 56, 8, 25, 43, 62, 18, 39, 61, 20, 44,
+], dtype=np.uint64)
+
+PI_LANES = np.array([
+    10, 7, 11, 17, 18, 3, 5, 16, 8, 21, 24, 4,
+    15, 23, 19, 13, 12, 2, 20, 14, 22, 9, 6, 1,
+], dtype=np.int64)
+
+# SHA3 padding lanes: 0x06 after the message, 0x80 in the last rate byte
+PAD_FIRST = np.uint64(0x06)
+PAD_LAST = np.uint64(0x8000000000000000)
+
+
+@njit(inline="always")
+def rotl64(x, n):
+    return (x << n) | (x >> (uint64(64) - n))
+
+
+@njit(nogil=True, cache=True)
+def keccak_f1600(st, bc):
+    for rnd in range(24):
+        # Theta
+        for i in range(5):
+            bc[i] = st[i] ^ st[i + 5] ^ st[i + 10] ^ st[i + 15] ^ st[i + 20]
+        for i in range(5):
+            t = bc[(i + 4) % 5] ^ rotl64(bc[(i + 1) % 5], uint64(1))
+            for j in range(0, 25, 5):
+                st[j + i] ^= t
+
+        # Rho + Pi
+        t = st[1]
+        for i in range(24):
+            j = PI_LANES[i]
+            bc[0] = st[j]
+            st[j] = rotl64(t, ROTATIONS[i])
+            t = bc[0]
+
+        # Chi
+        for j in range(0, 25, 5):
+            for i in range(5):
+                bc[i] = st[j + i]
+            for i in range(5):
+                st[j + i] ^= ~bc[(i + 1) % 5] & bc[(i + 2) % 5]
+
+        # Iota
+        st[0] ^= ROUND_CONSTANTS[rnd]
+
+
+@njit(inline="always")
+def bswap64(x):
+    x = ((x & uint64(0x00FF00FF00FF00FF)) << uint64(8)) | ((x >> uint64(8)) & uint64(0x00FF00FF00FF00FF))
+    x = ((x & uint64(0x0000FFFF0000FFFF)) << uint64(16)) | ((x >> uint64(16)) & uint64(0x0000FFFF0000FFFF))
+    return (x << uint64(32)) | (x >> uint64(32))
+
+
+# ====================
+# MINING KERNEL
+# ====================
+@njit(nogil=True, cache=True)
+def mine_range(header_words, target_words, start_nonce, count):
+    """Offset of the first nonce in [start_nonce, start_nonce + count) meeting the target, or -1"""
+    st = np.zeros(25, dtype=np.uint64)
+    bc = np.zeros(5, dtype=np.uint64)
+
+    # Inner hash state with header_hash and padding absorbed; only the nonce lane changes
+    base = np.zeros(25, dtype=np.uint64)
+    base[0:4] = header_words
+    base[5] = PAD_FIRST
+    base[16] = PAD_LAST
+
+    for i in range(count):
+        # Inner hash: header_hash || nonce (40 bytes) + padding
+        st[:] = base
+        st[4] = start_nonce + uint64(i)
+        keccak_f1600(st, bc)
+
+        # Outer hash: first digest (lanes 0..3) + padding
+        st[4:] = 0
+        st[4] = PAD_FIRST
+        st[16] = PAD_LAST
+        keccak_f1600(st, bc)
+
+        # Digest and target as big-endian 64-bit words
+        for w in range(4):
+            d = bswap64(st[w])
+            if d != target_words[w]:
+                if d < target_words[w]:
+                    return i
+                break
+        else:
+            return i
+    return -1
+
+
+@njit(nogil=True, parallel=True, cache=True)
+def mine_kernel(header_words, target_words, start_nonce, budget, n_ranges):
+    """Split budget nonces into n_ranges ranges mined across cores; first hit offset or -1"""
+    size = (budget + n_ranges - 1) // n_ranges
+    hits = np.full(n_ranges, -1, dtype=np.int64)
+
+    for r in prange(n_ranges):
+        lo = r * size
+        hi = min(budget, lo + size)
+        if lo < hi:
+            offset = mine_range(header_words, target_words, start_nonce + uint64(lo), hi - lo)
+            if offset >= 0:
+                hits[r] = lo + offset
+
+    for r in range(n_ranges):
+        if hits[r] >= 0:
+            return hits[r]
+    return -1
+
+
+def mine_batch(header_hash: bytes, target_bytes: bytes, start_nonce: int, count: int):
+    """Numba equivalent of _miner.mine_batch"""
+    header_words = np.frombuffer(header_hash, dtype="<u8").astype(np.uint64)
+    target_words = np.frombuffer(target_bytes, dtype=">u8").astype(np.uint64)
+
+    offset = mine_kernel(header_words, target_words, np.uint64(start_nonce), count, get_num_threads())
+    if offset < 0:
+        return None
+    return (start_nonce + offset) & 0xFFFFFFFFFFFFFFFF
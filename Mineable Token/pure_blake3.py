@@ -0,0 +1,110 @@
+"""
+Pure-Python BLAKE3 (32-byte digests, hash mode only).
+
+Stand-in for the blake3 package on interpreters without a wheel for it, such
+as PyPy. The miner hashes one block header per template, so speed is not a
+concern here. Mirrors the blake3.blake3(data).digest() interface.
+"""
+import struct
+
+IV = (
+    0x6A09E667, 0xBB67AE85, 0x3C6EF372, 0xA54FF53A,
+    0x510E527F, 0x9B05688C, 0x1F83D9AB, 0x5BE0CD19,
+)
+
+MSG_PERMUTATION = (2, 6, 3, 10, 7, 0, 4, 13, 1, 11, 12, 5, 9, 14, 15, 8)
+
+CHUNK_START = 1 << 0
+CHUNK_END = 1 << 1
+PARENT = 1 << 2
+ROOT = 1 << 3
+
+BLOCK_LEN = 64
+CHUNK_LEN = 1024
+MASK32 = 0xFFFFFFFF
+
+
+def _g(s, a, b, c, d, mx, my):
+    s[a] = (s[a] + s[b] + mx) & MASK32
+    s[d] ^= s[a]
+    s[d] = (s[d] >> 16) | (s[d] << 16) & MASK32
+    s[c] = (s[c] + s[d]) & MASK32
+    s[b] ^= s[c]
+    s[b] = (s[b] >> 12) | (s[b] << 20) & MASK32
+    s[a] = (s[a] + s[b] + my) & MASK32
+    s[d] ^= s[a]
+    s[d] = (s[d] >> 8) | (s[d] << 24) & MASK32
+    s[c] = (s[c] + s[d]) & MASK32
+    s[b] ^= s[c]
+    s[b] = (s[b] >> 7) | (s[b] << 25) & MASK32
+
+
+def _compress(cv, block_words, counter, block_len, flags):
+    s = list(cv) + list(IV[:4]) + [counter & MASK32, counter >> 32, block_len, flags]
+    m = list(block_words)
+
+    for rnd in range(7):
+        _g(s, 0, 4, 8, 12, m[0], m[1])
+        _g(s, 1, 5, 9, 13, m[2], m[3])
+        _g(s, 2, 6, 10, 14, m[4], m[5])
+        _g(s, 3, 7, 11, 15, m[6], m[7])
+        _g(s, 0, 5, 10, 15, m[8], m[9])
+        _g(s, 1, 6, 11, 12, m[10], m[11])
+        _g(s, 2, 7, 8, 13, m[12], m[13])
+        _g(s, 3, 4, 9, 14, m[14], m[15])
+        if rnd < 6:
+            m = [m[i] for i in MSG_PERMUTATION]
+
+    for i in range(8):
+        s[i] ^= s[i + 8]
+        s[i + 8] ^= cv[i]
+    return s
+
+
+def _words(block: bytes):
+    return struct.unpack("<16I", block.ljust(BLOCK_LEN, b"\0"))
+
+
+def _chunk_output(chunk: bytes, chunk_counter: int):
+    """Compression inputs of the chunk's last block, all earlier blocks applied"""
+    blocks = [chunk[i:i + BLOCK_LEN] for i in range(0, len(chunk), BLOCK_LEN)] or [b""]
+    cv = IV
+
+    for i, block in enumerate(blocks):
+        flags = CHUNK_START if i == 0 else 0
+        if i == len(blocks) - 1:
+            return cv, _words(block), chunk_counter, len(block), flags | CHUNK_END
+        cv = _compress(cv, _words(block), chunk_counter, BLOCK_LEN, flags)[:8]
+
+
+def _subtree_output(data: bytes, chunk_counter: int):
+    if len(data) <= CHUNK_LEN:
+        return _chunk_output(data, chunk_counter)
+
+    # Left subtree holds the largest power of two number of chunks
+    num_chunks = (len(data) + CHUNK_LEN - 1) // CHUNK_LEN
+    left_chunks = 1 << ((num_chunks - 1).bit_length() - 1)
+    left_len = left_chunks * CHUNK_LEN
+
+    left_cv = _compress(*_subtree_output(data[:left_len], chunk_counter))[:8]
+    right_cv = _compress(*_subtree_output(data[left_len:], chunk_counter + left_chunks))[:8]
+    return IV, tuple(left_cv + right_cv), 0, BLOCK_LEN, PARENT
+
+
+class blake3:
+    """Minimal drop-in for blake3.blake3 supporting update() and 32-byte digest()"""
+
+    def __init__(self, data: bytes = b""):
+        self._data = bytearray(data)
+
+    def update(self, data: bytes):
+        self._data += data
+        return self
+
+    def digest(self) -> bytes:
+        cv, block_words, counter, block_len, flags = _subtree_output(bytes(self._data), 0)
+        out = _compress(cv, block_words, counter, block_len, flags | ROOT)
+        return struct.pack("<8I", *out[:8])
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
@@ -0,0 +1,36 @@
+import os
+import sys
+
+from setuptools import setup, Extension
+
+# Build the native mining kernel next to the miner script:
+#   python setup.py build_ext --inplace
+#
+# Optionally link XKCP's KeccakP-1600-times4 for the 4-way kernel by pointing
+# XKCP_DIR at an XKCP checkout built with `make AVX2/libXKCP.a` (set
+# XKCP_TARGET to use another build target).
+extra_compile_args = [] if sys.platform == "win32" else ["-O3"]
+define_macros = []
+include_dirs = []
+extra_objects = []
+
+xkcp_dir = os.environ.get("XKCP_DIR")
+if xkcp_dir:
+    xkcp_lib = os.path.join(xkcp_dir, "bin", os.environ.get("XKCP_TARGET", "AVX2"), "libXKCP.a")
+    define_macros.append(("HAVE_XKCP", "1"))
+    include_dirs.append(xkcp_lib + ".headers")
+    extra_objects.append(xkcp_lib)
+
+setup(
+    name="xelis-contract-miner",
+    ext_modules=[
+        Extension(
+            "_miner",
+            sources=["_miner.c"],
+            define_macros=define_macros,
+            include_dirs=include_dirs,
+            extra_objects=extra_objects,
+            extra_compile_args=extra_compile_args,
+        ),
+    ],
+)
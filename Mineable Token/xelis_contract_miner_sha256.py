@@ -1,17 +1,42 @@
 import asyncio
+import concurrent.futures
 import struct
 import hashlib
+import os
 import sys
 import time
 import json
-import requests
-import blake3
-from requests.auth import HTTPBasicAuth
+import queue
+import multiprocessing
+import httpx
 import websockets
 from threading import Thread, Lock, Event
-import random
 import argparse
 
+try:
+    import blake3
+except ImportError:
+    # No blake3 wheel (e.g. PyPy): pure-Python BLAKE3, used once per template
+    import pure_blake3 as blake3
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    # No orjson build for PyPy
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
+try:
+    # Native kernel, build with: python setup.py build_ext --inplace
+    from _miner import mine_batch as native_mine_batch, sha3_256d_40, SIMD_LANES, HAVE_XKCP
+except ImportError:
+    native_mine_batch = None
+    sha3_256d_40 = None
+    SIMD_LANES = 0
+    HAVE_XKCP = False
+
 # ====================
 # CONFIG
 # ====================
@@ -27,31 +52,28 @@ ENTRY_ID_SUBMIT = 5
 CONTRACT_EVENT_ID = 1
 
 
-def decode_xet_address(address):
-    # Bech32 charset
-    charset = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+# Bech32 charset, and its inverse: byte -> 5-bit value, 0xFF outside the charset
+BECH32_CHARSET = b"qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+BECH32_REV = bytes(BECH32_CHARSET.find(c) & 0xFF for c in range(256))
+
 
+def decode_xet_address(address):
     # Get the data part after colon
     _, data_part = address.split(':')
 
-    # Decode each character to its 5-bit value
-    data_5bit = [charset.index(c) for c in data_part]
+    # Decode every character to its 5-bit value in one translate() call
+    data_5bit = data_part.encode("ascii").translate(BECH32_REV)
+    if b"\xff" in data_5bit:
+        raise ValueError(f"Invalid bech32 character in {data_part!r}")
 
     # Convert from 5-bit to 8-bit (without padding at the end)
     acc = 0
-    bits = 0
-    result = []
-
     for value in data_5bit:
         acc = (acc << 5) | value
-        bits += 5
-
-        while bits >= 8:
-            bits -= 8
-            result.append((acc >> bits) & 0xFF)
+    total_bits = 5 * len(data_5bit)
+    result = (acc >> (total_bits % 8)).to_bytes(total_bits // 8, "big")
 
-    result = [0] + result[:33]
-    return result
+    return b"\0" + result[:33]
 
 
 MAX_TARGET = (1 << 256) - 1
@@ -67,33 +89,72 @@ HASHRATE_REPORT_INTERVAL = 10
 # Timestamp refresh interval (seconds)
 TIMESTAMP_REFRESH_INTERVAL = 10
 
+# Oldest ts (seconds) still submitted: the contract accepts 30s, minus room for the transaction
+TIMESTAMP_MAX_AGE = 25
+
+# RPC client timeout (seconds)
+RPC_TIMEOUT = 15
+
+# Seconds the coordinator waits for a submission on the event loop; longer than
+# the client timeout so the request normally fails there first
+SUBMIT_TIMEOUT = RPC_TIMEOUT + 5
+
+# Nonces hashed per kernel call between restart checks
+NATIVE_BATCH_SIZE = 1_000_000
+PYTHON_BATCH_SIZE = 100_000
+
+U64_MASK = (1 << 64) - 1
+
 # ====================
 # AUTHENTICATED SESSION
 # ====================
-session = requests.Session()
-session.auth = HTTPBasicAuth(RPC_USER, RPC_PASS)
-session.headers.update({"Content-Type": "application/json"})
+# Persistent client: keeps connections to the node and wallet warm between calls.
+# Created on first use, so spawned workers importing this module don't open one
+CLIENT_OPTIONS = dict(
+    http2=True,
+    auth=(RPC_USER, RPC_PASS),
+    headers={"Content-Type": "application/json"},
+    timeout=RPC_TIMEOUT
+)
+client = None
+
+# Async client and its loop, owned by listen_contract_events; solutions are submitted there
+async_client = None
+event_loop = None
 
 
 # ====================
 # RPC HELPERS
 # ====================
-def rpc_call(url: str, method: str, params: dict):
-    payload = {
+def rpc_payload(method: str, params: dict) -> bytes:
+    return json_dumps({
         "jsonrpc": "2.0",
         "method": method,
         "id": 1,
         "params": params,
         "broadcast": True
-    }
-    r = session.post(url, json=payload, timeout=15)
+    })
+
+
+def rpc_result(r: httpx.Response):
     r.raise_for_status()
-    j = r.json()
+    j = json_loads(r.content)
     if "error" in j:
         raise RuntimeError(j["error"])
     return j["result"]
 
 
+def rpc_call(url: str, method: str, params: dict):
+    global client
+    if client is None:
+        client = httpx.Client(**CLIENT_OPTIONS)
+    return rpc_result(client.post(url, content=rpc_payload(method, params)))
+
+
+async def rpc_call_async(url: str, method: str, params: dict):
+    return rpc_result(await async_client.post(url, content=rpc_payload(method, params)))
+
+
 def get_contract_data(contract_hash: str, key: str):
     return rpc_call(NODE_RPC_URL,
                     "get_contract_data",
@@ -107,24 +168,41 @@ def get_contract_data(contract_hash: str, key: str):
                     )
 
 
+def submit_params(nonce: int, ts: int) -> dict:
+    return {
+        "invoke_contract": {
+            "contract": CONTRACT_HASH,
+            "max_gas": MAX_GAS,
+            "entry_id": ENTRY_ID_SUBMIT,
+            "parameters": [
+                {"type": "primitive", "value": {"type": "u64", "value": str(nonce)}},
+                {"type": "primitive", "value": {"type": "u64", "value": str(ts)}}
+            ],
+            "permission": "all"
+        },
+        "broadcast": True
+    }
+
+
 def submit_solution(nonce: int, ts: int):
-    result = rpc_call(RPC_URL,
-                      "build_transaction",
-                      {
-                          "invoke_contract": {
-                              "contract": CONTRACT_HASH,
-                              "max_gas": MAX_GAS,
-                              "entry_id": ENTRY_ID_SUBMIT,
-                              "parameters": [
-                                  {"type": "primitive", "value": {"type": "u64", "value": str(nonce)}},
-                                  {"type": "primitive", "value": {"type": "u64", "value": str(ts)}}
-                              ],
-                              "permission": "all"
-                          },
-                          "broadcast": True
-                      }
-                      )
-    return result
+    return rpc_call(RPC_URL, "build_transaction", submit_params(nonce, ts))
+
+
+async def submit_solution_async(nonce: int, ts: int):
+    return await rpc_call_async(RPC_URL, "build_transaction", submit_params(nonce, ts))
+
+
+def submit_from_thread(nonce: int, ts: int):
+    """Submit on the event loop's client when it is running, blocking for the result"""
+    if event_loop is None or async_client is None:
+        return submit_solution(nonce, ts)
+    fut = asyncio.run_coroutine_threadsafe(submit_solution_async(nonce, ts), event_loop)
+    try:
+        return fut.result(SUBMIT_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        # Don't leave the request running after reporting the submission as failed
+        fut.cancel()
+        raise
 
 
 def parse_contract_error(result):
@@ -164,6 +242,11 @@ def sha3_256d(data: bytes) -> bytes:
     return hashlib.sha3_256(hashlib.sha3_256(data).digest()).digest()
 
 
+if sha3_256d_40 is not None:
+    # Only ever hashed over header_hash || nonce (40 bytes)
+    sha3_256d = sha3_256d_40
+
+
 def generate_header_hash(
         block_number: int,
         miner: bytes,
@@ -182,10 +265,80 @@ def generate_header_hash(
     return blake3.blake3(header).digest()
 
 
-def meets_difficulty(final_hash: bytes, difficulty: int) -> bool:
-    hv = int.from_bytes(final_hash)
-    target = MAX_TARGET // difficulty
-    return hv <= target
+def difficulty_target(difficulty: int) -> bytes:
+    """PoW target as a 32-byte big-endian buffer, comparable to hashes with <="""
+    return (MAX_TARGET // difficulty).to_bytes(32, "big")
+
+
+def py_mine_batch(header_hash: bytes, target_bytes: bytes, start_nonce: int, count: int):
+    """Pure-Python fallback for _miner.mine_batch"""
+    sha3_256 = hashlib.sha3_256
+    pack_into = struct.pack_into
+
+    # header_hash is absorbed once; each nonce only adds its 8 bytes to a copy
+    base = sha3_256(header_hash)
+    nonce_bytes = bytearray(8)
+
+    for nonce in range(start_nonce, start_nonce + count):
+        pack_into("<Q", nonce_bytes, 0, nonce)
+        h = base.copy()
+        h.update(nonce_bytes)
+        final_hash = sha3_256(h.digest()).digest()
+        if final_hash <= target_bytes:
+            return nonce
+    return None
+
+
+# Kernels selectable with --kernel; "auto" picks the fastest available
+KERNELS = ("auto", "native", "llvm", "numba", "python", "cuda")
+
+
+def load_kernel(kernel: str = "auto"):
+    """Load a mining kernel: (mine_batch, batch_size, name, parallel)
+
+    "auto" tries the SIMD extension, the LLVM JIT kernel, the scalar
+    extension, Numba and pure Python, in that order. The optional kernels are
+    imported here so workers only load the one they use. Parallel kernels
+    already spread each batch over every core or the GPU.
+    """
+    if kernel == "cuda":
+        import keccak_cuda
+        return keccak_cuda.mine_batch, NATIVE_BATCH_SIZE, f"CUDA ({keccak_cuda.device_name()})", True
+
+    if kernel == "native" or (kernel == "auto" and SIMD_LANES > 1):
+        if native_mine_batch is None:
+            raise RuntimeError("_miner extension not built, run: python setup.py build_ext --inplace")
+        name = f"native ({SIMD_LANES}-way SIMD)" if SIMD_LANES > 1 else "native (scalar)"
+        if HAVE_XKCP and SIMD_LANES == 4:
+            name += " via XKCP"
+        return native_mine_batch, NATIVE_BATCH_SIZE, name, False
+
+    if kernel in ("auto", "llvm"):
+        try:
+            # LLVM JIT kernel, ahead of the scalar extension (llvmlite ships with numba).
+            # The import compiles a test kernel; any failure means this llvmlite can't be used
+            import keccak_llvm
+        except Exception:
+            if kernel == "llvm":
+                raise
+        else:
+            return keccak_llvm.mine_batch, NATIVE_BATCH_SIZE, "LLVM (JIT)", False
+
+    if kernel == "auto" and native_mine_batch is not None:
+        return native_mine_batch, NATIVE_BATCH_SIZE, "native (scalar)", False
+
+    if kernel in ("auto", "numba"):
+        try:
+            # JIT kernel using every core from one process: pip install numba
+            import keccak_numba
+        except ImportError:
+            if kernel == "numba":
+                raise
+        else:
+            name = f"Numba ({keccak_numba.get_num_threads()} threads)"
+            return keccak_numba.mine_batch, NATIVE_BATCH_SIZE, name, True
+
+    return py_mine_batch, PYTHON_BATCH_SIZE, "pure Python", False
 
 
 # ====================
@@ -201,6 +354,7 @@ class MiningState:
 
         self.block_number = 0
         self.difficulty = 1
+        self.target_bytes = difficulty_target(self.difficulty)  # Derived from difficulty once per sync
         self.prev_hash = bytes(32)
         self.prev_hash_xel = bytes(32)
         self.ts = int(time.time() * 1000)
@@ -227,13 +381,110 @@ def sync_chain_state(contract: str):
 
 
 # ====================
-# SINGLE-THREADED MINER (Optimized)
+# WORKER PROCESSES
 # ====================
-def mine_loop(address_bytes: bytes):
-    """Optimized single-threaded mining loop with minimal overhead"""
+# Spawned rather than forked: a fork would copy the coordinator's threads, locks and CUDA
+# context mid-use. Spawned workers re-import this module, which only builds cheap
+# unused globals (the RPC client is created on first use)
+mp_context = multiprocessing.get_context("spawn")
+
+
+class SharedMiningState:
+    """Template and nonce space shared between the coordinator and worker processes"""
+
+    def __init__(self):
+        self.mining = mp_context.Event()  # Set while workers should hash the current template
+        self.template = mp_context.Array("c", 64)  # header_hash || target_bytes
+        self.template_id = mp_context.Value("Q", 0, lock=False)  # Guarded by the template lock
+        self.next_nonce = mp_context.Value("Q", 0)  # Next unclaimed batch start
+        self.hashes = mp_context.Value("Q", 0)
+        self.solutions = mp_context.Queue()  # (template_id, nonce)
+
+    def publish_template(self, header_hash: bytes, target_bytes: bytes, start_nonce: int) -> int:
+        self.mining.clear()
+        with self.template.get_lock():
+            self.template.raw = header_hash + target_bytes
+            self.template_id.value += 1
+            template_id = self.template_id.value
+        with self.next_nonce.get_lock():
+            self.next_nonce.value = start_nonce
+        self.mining.set()
+        return template_id
+
+    def stop_mining(self):
+        """Park the workers; bumping template_id abandons their in-flight batches"""
+        self.mining.clear()
+        with self.template.get_lock():
+            self.template_id.value += 1
+
+    def read_template(self):
+        with self.template.get_lock():
+            raw = self.template.raw
+            return self.template_id.value, raw[:32], raw[32:]
+
+    def claim_nonces(self, count: int) -> int:
+        """Atomic fetch_add on the shared nonce counter; the claimed range belongs to one worker"""
+        with self.next_nonce.get_lock():
+            start = self.next_nonce.value
+            self.next_nonce.value = (start + count) & U64_MASK
+        return start
+
+    def add_hashes(self, count: int):
+        with self.hashes.get_lock():
+            self.hashes.value += count
+
+    def take_hashes(self) -> int:
+        with self.hashes.get_lock():
+            count = self.hashes.value
+            self.hashes.value = 0
+        return count
+
+
+def mine_worker(shared: SharedMiningState, kernel: str):
+    """Worker process: hash disjoint nonce batches of the current template until stopped"""
+    mine_batch, batch_size, _, _ = load_kernel(kernel)
+
+    # The native kernel polls template_id itself and drops a batch as soon as it changes
+    cancellable = mine_batch is native_mine_batch
+
+    while True:
+        shared.mining.wait()
+        template_id, header_hash, target_bytes = shared.read_template()
+        if not shared.mining.is_set():
+            # Stopped between wait() and read_template()
+            continue
+
+        # Hot mining loop - one kernel call per batch; template_id is a lock-free
+        # shared word that changes on every new template or stop
+        while shared.template_id.value == template_id:
+            start = shared.claim_nonces(batch_size)
+            if cancellable:
+                # May stop early, so the kernel reports how many nonces it hashed
+                found, hashed = mine_batch(header_hash, target_bytes, start, batch_size,
+                                           shared.template_id, template_id)
+            else:
+                found = mine_batch(header_hash, target_bytes, start, batch_size)
+                hashed = batch_size if found is None else ((found - start) & U64_MASK) + 1
+
+            shared.add_hashes(hashed)
+            if found is not None:
+                shared.solutions.put((template_id, found))
+
 
-    last_report = time.time()
-    local_hashes = 0
+def start_workers(shared: SharedMiningState, num_workers: int, kernel: str):
+    workers = []
+    for _ in range(num_workers):
+        worker = mp_context.Process(target=mine_worker, args=(shared, kernel), daemon=True)
+        worker.start()
+        workers.append(worker)
+    return workers
+
+
+# ====================
+# MINING COORDINATOR
+# ====================
+def mine_loop(address_bytes: bytes, shared: SharedMiningState, workers: list):
+    """Sync templates, hand them to the worker processes and submit their solutions"""
 
     while True:
         # Wait for restart signal
@@ -246,12 +497,14 @@ def mine_loop(address_bytes: bytes):
                     continue
                 time.sleep(0.1)
                 state.block_number, state.difficulty, state.prev_hash, state.prev_hash_xel = sync_chain_state(CONTRACT_HASH)
+                state.target_bytes = difficulty_target(state.difficulty)
 
                 state.ts = int(time.time() * 1000)
                 state.restart_event.clear()
 
                 block_number = state.block_number
                 difficulty = state.difficulty
+                target_bytes = state.target_bytes
                 prev_hash = state.prev_hash
                 prev_hash_xel = state.prev_hash_xel
                 current_ts = state.ts
@@ -268,10 +521,12 @@ def mine_loop(address_bytes: bytes):
                 current_ts
             )
 
-            # Start with random nonce
-            nonce = random.randint(0, 2 ** 32)
-            start_time = time.time()
+            # Start the shared counter at a random point of the 63-bit space; workers
+            # claim batches from there, so the counter cannot wrap in practice
+            nonce = int.from_bytes(os.urandom(8), "little") & 0x7FFFFFFFFFFFFFFF
+            start_time = time.monotonic()
             last_report = start_time
+            last_refresh = start_time
             local_hashes = 0
 
         except Exception as e:
@@ -279,19 +534,36 @@ def mine_loop(address_bytes: bytes):
             time.sleep(5)
             continue
 
-        # Hot mining loop - no locks, no checks, pure speed
+        template_id = shared.publish_template(header_hash, target_bytes, nonce)
+        shared.take_hashes()
+
+        # Batches that were not cancelled by a re-stamp still report hits against
+        # their own header, and those stay valid while its ts is inside the window
+        templates = {template_id: (header_hash, current_ts)}
+
+        # Workers hash; wait for solutions, restart checked once per second
         while not state.restart_event.is_set():
-            # Hash attempt (this is the hottest path - keep it minimal)
-            data = header_hash + struct.pack("<Q", nonce)
-            final_hash = sha3_256d(data)
-            local_hashes += 1
+            try:
+                solution_template_id, nonce = shared.solutions.get(timeout=1)
+            except queue.Empty:
+                solution_template_id = None
+
+            if solution_template_id in templates:
+                solution_header_hash, solution_ts = templates[solution_template_id]
+                if time.time() * 1000 - solution_ts > TIMESTAMP_MAX_AGE * 1000:
+                    continue
+
+                final_hash = sha3_256d(solution_header_hash + struct.pack("<Q", nonce))
+
+                if final_hash > target_bytes:
+                    print(f"❌ Kernel returned invalid nonce {nonce}, skipping")
+                    continue
 
-            # Check difficulty
-            if meets_difficulty(final_hash, difficulty):
+                shared.stop_mining()
                 print(f"\n🎉 SOLUTION FOUND! nonce={nonce} hash={final_hash.hex()}")
 
                 try:
-                    res = submit_solution(nonce, current_ts)
+                    res = submit_from_thread(nonce, solution_ts)
 
                     error_msg = parse_contract_error(res)
                     if error_msg:
@@ -317,23 +589,65 @@ def mine_loop(address_bytes: bytes):
                 state.restart_event.wait()
                 break
 
-            nonce += 1
+            # A worker only exits on an error (kernel, CUDA, ...); mining on without it
+            # would just report a falling hashrate, so stop the whole miner
+            dead = [worker for worker in workers if not worker.is_alive()]
+            if dead:
+                print(f"❌ Mining process {dead[0].pid} exited with code {dead[0].exitcode}, stopping miner")
+                for worker in workers:
+                    worker.terminate()
+                os._exit(1)
+
+            # Hashrate reporting
+            local_hashes += shared.take_hashes()
+            current_time = time.monotonic()
+            if current_time - last_report > HASHRATE_REPORT_INTERVAL:
+                elapsed = current_time - start_time
+                hashrate = local_hashes / elapsed
+                print(f"Hashrate: {hashrate / 1000:.2f} KH/s ({hashrate / 1e6:.4f} MH/s) | Nonce: {shared.next_nonce.value:,}")
+                last_report = current_time
+
+            # The contract rejects ts older than 30s: re-stamp the header
+            # without resyncing, the chain state only changes on an event
+            if current_time - last_refresh > TIMESTAMP_REFRESH_INTERVAL:
+                current_ts = int(time.time() * 1000)
+                with state.lock:
+                    state.ts = current_ts
+                header_hash = generate_header_hash(
+                    block_number,
+                    address_bytes,
+                    difficulty,
+                    prev_hash,
+                    prev_hash_xel,
+                    current_ts
+                )
+                template_id = shared.publish_template(header_hash, target_bytes, shared.next_nonce.value)
+                last_refresh = current_time
+
+                templates[template_id] = (header_hash, current_ts)
+                templates = {
+                    tid: (hh, ts) for tid, (hh, ts) in templates.items()
+                    if current_ts - ts <= TIMESTAMP_MAX_AGE * 1000
+                }
 
-            # Hashrate reporting (minimal overhead check)
-            if local_hashes % 100000 == 0:
-                current_time = time.time()
-                if current_time - last_report > HASHRATE_REPORT_INTERVAL:
-                    elapsed = current_time - start_time
-                    hashrate = local_hashes / elapsed
-                    print(f"Hashrate: {hashrate / 1000:.2f} KH/s ({hashrate / 1e6:.4f} MH/s) | Nonce: {nonce:,}")
-                    last_report = current_time
-                    state.restart_event.set()
+        shared.stop_mining()
 
 
 # ====================
 # CONTRACT EVENT LISTENER
 # ====================
 async def listen_contract_events():
+    global async_client, event_loop
+
+    async with httpx.AsyncClient(**CLIENT_OPTIONS) as async_client:
+        event_loop = asyncio.get_running_loop()
+        try:
+            await watch_contract_events()
+        finally:
+            event_loop = None
+
+
+async def watch_contract_events():
     while True:
         try:
             async with websockets.connect(WS_URL, ping_interval=20, ping_timeout=60) as ws:
@@ -385,13 +699,28 @@ async def listen_contract_events():
 # ====================
 # MAIN
 # ====================
+def positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def default_workers() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description='XELIS Smart Contract Miner (Optimized Single Thread)',
+        description='XELIS Smart Contract Miner (Multi-Process)',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
-Note: Python's GIL makes multi-threading slower for CPU-bound tasks like mining.
-This single-threaded version is optimized for maximum hashrate.
+Note: Mining runs in worker processes, one per CPU core by default, each
+hashing its own nonce batches. The Numba and CUDA kernels use all cores or the
+GPU from a single worker.
 
 Example:
   %(prog)s --address xet:4cka26kpvq6nj93lguycywn8flccvrf537dzqa0x0jyhawddepfsqtka05w
@@ -429,7 +758,28 @@ Example:
         help=f'Maximum gas per transaction (default: {MAX_GAS:,})'
     )
 
+    parser.add_argument(
+        '--kernel',
+        choices=KERNELS,
+        default='auto',
+        help='Mining kernel (default: auto, the fastest available: native SIMD, llvm, native scalar, numba, python)'
+    )
+
+    parser.add_argument(
+        '--gpu',
+        action='store_true',
+        help='Mine on a CUDA GPU (requires cupy), same as --kernel cuda'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=positive_int,
+        default=None,
+        help='Number of mining processes (default: one per available CPU core, 1 for the numba and cuda kernels)'
+    )
+
     args = parser.parse_args()
+    kernel = 'cuda' if args.gpu else args.kernel
 
     # Update globals
     RPC_URL = args.rpc_url
@@ -437,6 +787,14 @@ Example:
     CONTRACT_HASH = args.contract
     MAX_GAS = args.max_gas
 
+    try:
+        _, _, kernel_name, parallel = load_kernel(kernel)
+    except Exception as e:
+        print(f"Error loading mining kernel: {e}")
+        sys.exit(1)
+
+    num_workers = args.workers or (1 if parallel else default_workers())
+
     print("=" * 60)
     print("XELIS Smart Contract Miner (Optimized)")
     print("=" * 60)
@@ -446,6 +804,8 @@ Example:
     print(f"Max Gas: {MAX_GAS:,}")
     print(f"RPC URL: {RPC_URL}")
     print(f"WebSocket URL: {WS_URL}")
+    print(f"Kernel: {kernel_name}")
+    print(f"Workers: {num_workers}")
     print("=" * 60)
 
     try:
@@ -454,8 +814,11 @@ Example:
         print(f"Error decoding address: {e}")
         sys.exit(1)
 
-    # Start mining in separate thread
-    miner_thread = Thread(target=mine_loop, args=(address_bytes,), daemon=True)
+    # Start mining processes, coordinated from a separate thread
+    shared = SharedMiningState()
+    workers = start_workers(shared, num_workers, kernel)
+
+    miner_thread = Thread(target=mine_loop, args=(address_bytes, shared, workers), daemon=True)
     miner_thread.start()
 
     # Run WebSocket listener